@@ -0,0 +1,84 @@
+import csv
+import io
+import json
+import unittest
+from contextlib import redirect_stderr
+from testuff import models
+from testuff.models import Run
+from testuff.export import export, export_columns, main
+
+
+class StubClient:
+    def __init__(self, pages, fail_at=None):
+        self.pages = pages
+        self.fail_at = fail_at
+
+    def get_pages(self, model_cls, **params):
+        for i, objects in enumerate(self.pages):
+            if i == self.fail_at:
+                raise RuntimeError("page failed")
+            yield objects
+
+
+def make_pages(count, size):
+    return [[{"id": f"{p}-{i}", "suite_id": "s", "summary": "a, b", "status": "MN", "test_category": "ui",
+              "labels": [{"name": "smoke"}], "steps": [{"position": 0, "description": "open"}]}
+             for i in range(size)] for p in range(count)]
+
+
+class TestExport(unittest.TestCase):
+
+    def test_columns_use_field_mapping(self):
+        columns = export_columns(models.Test)
+        self.assertIn("status", columns)
+        self.assertIn("test_category", columns)
+        self.assertNotIn("stage", columns)
+        self.assertNotIn("category", columns)
+
+    def test_jsonl(self):
+        for workers in (None, 2):
+            out = io.StringIO()
+            self.assertEqual(export(StubClient(make_pages(5, 10)), models.Test, out, "jsonl", workers), 50)
+            rows = [json.loads(line) for line in out.getvalue().splitlines()]
+            self.assertEqual([row["id"] for row in rows[:2]], ["0-0", "0-1"])
+            self.assertEqual(rows[0]["status"], "MN")
+            self.assertEqual(rows[0]["test_category"], "ui")
+            self.assertEqual(rows[0]["labels"], ["smoke"])
+
+    def test_csv(self):
+        for workers in (None, 2):
+            out = io.StringIO()
+            self.assertEqual(export(StubClient(make_pages(3, 10)), models.Test, out, "csv", workers), 30)
+            rows = list(csv.DictReader(io.StringIO(out.getvalue())))
+            self.assertEqual(len(rows), 30)
+            self.assertEqual(list(rows[0]), export_columns(models.Test))
+            self.assertEqual(rows[0]["summary"], "a, b")
+            self.assertEqual(rows[0]["status"], "MN")
+            self.assertEqual(json.loads(rows[0]["steps"])[0]["description"], "open")
+            self.assertEqual(rows[0]["preconditions"], "")
+
+    def test_fetch_error_propagates(self):
+        for workers in (None, 2):
+            with self.assertRaisesRegex(RuntimeError, "page failed"):
+                export(StubClient(make_pages(10, 5), fail_at=3), Run, io.StringIO(), workers=workers, queue_size=1)
+
+    def test_decode_error_propagates(self):
+        pages = make_pages(3, 5) + [["not a dict"]] + make_pages(3, 5)
+        with self.assertRaises(AttributeError):
+            export(StubClient(pages), Run, io.StringIO(), workers=2)
+
+    def test_rejects_unbounded_settings(self):
+        for kwargs in ({"queue_size": 0}, {"workers": 0}, {"fmt": "xml"}):
+            with self.assertRaises(ValueError):
+                export(StubClient([]), Run, io.StringIO(), **kwargs)
+
+    def test_cli_rejects_bad_arguments(self):
+        base = ["--email", "e", "--password", "p"]
+        for argv in (["Nope"], ["Run", "brnch_id=X"], ["Run", "branch_id"],
+                     ["Run", "--queue-size", "0"], ["Run", "--workers", "0"]):
+            with self.assertRaises(SystemExit), redirect_stderr(io.StringIO()):
+                main(base + argv)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,124 @@
+import json
+import os
+import tempfile
+import threading
+import unittest
+from testuff import models
+from testuff.models import Suite
+from testuff.importer import BulkImporter, import_definitions, read_definitions
+
+DEFINITIONS = [
+    {"name": "Root", "tests": [{"summary": "t1", "automation_id": "a1"}], "suites": [
+        {"name": "Child", "tests": [
+            {"summary": "t2", "automation_id": "a2", "labels": ["smoke"],
+             "steps": ["open", {"description": "login", "expected": "ok"}]},
+        ]},
+        {"name": "Broken", "suites": [{"name": "Grandchild", "tests": [{"summary": "t3"}]}]},
+    ]},
+    {"name": "Other"},
+]
+
+
+class StubClient:
+    def __init__(self, failing=()):
+        self.failing = set(failing)
+        self.suites = []
+        self.tests = []
+        self.lock = threading.Lock()
+
+    def get(self, model_cls, **params):
+        return iter(list(self.suites if model_cls is Suite else self.tests))
+
+    def add(self, model_cls, **params):
+        if params.get("name") in self.failing:
+            raise RuntimeError("server error")
+        with self.lock:
+            if model_cls is Suite:
+                if params.get("parent_id"):
+                    parent_ids = [s.id for s in self.suites]
+                    assert params["parent_id"] in parent_ids, "parent created after child"
+                obj = Suite(id=f"s{len(self.suites)}", name=params["name"], branch_id=params["branch_id"],
+                            parent_id=params.get("parent_id"))
+                self.suites.append(obj)
+            else:
+                assert params["suite_id"] in [s.id for s in self.suites], "test created before its suite"
+                obj = models.Test(id=f"t{len(self.tests)}", **params)
+                self.tests.append(obj)
+        return obj
+
+
+class TestImporter(unittest.TestCase):
+
+    def test_creates_in_dependency_order(self):
+        client = StubClient()
+        report = BulkImporter(client, "b", concurrency=4).run(DEFINITIONS)
+        self.assertEqual(report.failures, [])
+        self.assertEqual(report.created, 8)
+        child = next(s for s in client.suites if s.name == "Child")
+        root = next(s for s in client.suites if s.name == "Root")
+        self.assertEqual(child.parent_id, root.id)
+        test = next(t for t in client.tests if t.automation_id == "a2")
+        self.assertEqual(test.suite_id, child.id)
+        self.assertEqual(test.steps, [{"position": 0, "description": "open"},
+                                      {"position": 1, "description": "login", "expected": "ok"}])
+
+    def test_rerun_is_idempotent(self):
+        client = StubClient()
+        BulkImporter(client, "b").run(DEFINITIONS)
+        report = BulkImporter(client, "b").run(DEFINITIONS)
+        self.assertEqual((report.created, report.skipped, report.failures), (0, 8, []))
+
+    def test_failures_cascade_to_children(self):
+        client = StubClient(failing={"Broken"})
+        report = BulkImporter(client, "b").run(DEFINITIONS)
+        self.assertEqual(report.created, 5)
+        self.assertEqual([(kind, error) for kind, definition, error in report.failures], [
+            ("suite", "server error"),
+            ("suite", "parent suite failed: Broken"),
+            ("test", "suite failed: Grandchild"),
+        ])
+        # A re-run once the server recovers only creates what is missing
+        client.failing = set()
+        report = BulkImporter(client, "b").run(DEFINITIONS)
+        self.assertEqual((report.created, report.skipped), (3, 5))
+
+    def test_duplicates_in_definitions(self):
+        client = StubClient()
+        definitions = [
+            {"name": "S", "tests": [{"summary": "x", "automation_id": "dup"}, {"summary": "y", "automation_id": "dup"},
+                                    {"summary": "z"}, {"summary": "z"}]},
+            {"name": "S"},
+        ]
+        report = BulkImporter(client, "b").run(definitions)
+        self.assertEqual(report.created, 3)
+        self.assertEqual(len(client.tests), 2)
+        self.assertEqual(len(report.failures), 3)
+
+    def test_non_mapping_definitions(self):
+        client = StubClient()
+        report = BulkImporter(client, "b").run(["stray", {"name": "S", "tests": [42, {"summary": "ok"}]}])
+        self.assertEqual(report.created, 2)
+        self.assertEqual([(kind, definition) for kind, definition, error in report.failures],
+                         [("suite", "stray"), ("test", 42)])
+
+    def test_consumes_definitions_as_an_iterator(self):
+        client = StubClient()
+        report = BulkImporter(client, "b").run(iter(DEFINITIONS))
+        self.assertEqual((report.created, report.failures), (8, []))
+
+    def test_read_definitions(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "defs.jsonl")
+            with open(path, "w") as f:
+                f.write(json.dumps(DEFINITIONS[0]) + "\n\n" + json.dumps([DEFINITIONS[1]]) + "\n")
+            self.assertEqual([d["name"] for d in read_definitions(path)], ["Root", "Other"])
+
+            path = os.path.join(directory, "defs.json")
+            with open(path, "w") as f:
+                json.dump({"suites": DEFINITIONS}, f)
+            self.assertEqual([d["name"] for d in read_definitions(path)], ["Root", "Other"])
+            self.assertEqual(import_definitions(StubClient(), "b", path).created, 8)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,87 @@
+import os
+import struct
+import tempfile
+import unittest
+from testuff.models import Run, Project
+from testuff.snapshot import write_snapshot, Snapshot, MAGIC, CACHE_LIMIT
+
+
+def make_runs(n):
+    for i in range(n):
+        yield Run(id=f"r{i}", test_id=f"t{i % 10}", status="failed" if i % 3 == 0 else "passed",
+                  priority=i % 4, labels=["smoke"] if i % 2 else [],
+                  steps=[{"position": 0, "description": "open"}] if i % 5 == 0 else None, comment=None)
+
+
+class TestSnapshot(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.dir.name, "runs.snap")
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def test_round_trip(self):
+        runs = list(make_runs(50))
+        self.assertEqual(write_snapshot(self.path, runs), 50)
+        with Snapshot(self.path) as snapshot:
+            self.assertIs(snapshot.model_cls, Run)
+            self.assertEqual(len(snapshot), 50)
+            self.assertEqual(list(snapshot), runs)
+            self.assertEqual(snapshot[-1], runs[-1])
+            self.assertEqual(list(snapshot.column("priority"))[:5], [0, 1, 2, 3, 0])
+
+    def test_slicing(self):
+        runs = list(make_runs(50))
+        write_snapshot(self.path, runs)
+        with Snapshot(self.path) as snapshot:
+            view = snapshot[10:20]
+            self.assertEqual(len(view), 10)
+            self.assertEqual(view[3], runs[13])
+            self.assertEqual(list(snapshot[::7]), runs[::7])
+            self.assertEqual(list(view[2:4].column("id")), ["r12", "r13"])
+
+    def test_empty(self):
+        self.assertEqual(write_snapshot(self.path, [], Project), 0)
+        with Snapshot(self.path) as snapshot:
+            self.assertIs(snapshot.model_cls, Project)
+            self.assertEqual(len(snapshot), 0)
+            self.assertEqual(list(snapshot), [])
+        with self.assertRaises(ValueError):
+            write_snapshot(self.path, [])
+
+    def test_ints_outside_int64(self):
+        runs = [Run(id="a", test_id=None, priority=2 ** 70), Run(id="b", test_id=None, priority=-2 ** 63),
+                Run(id="c", test_id=None, priority=None)]
+        write_snapshot(self.path, runs)
+        with Snapshot(self.path) as snapshot:
+            self.assertEqual(list(snapshot.column("priority")), [2 ** 70, -2 ** 63, None])
+
+    def test_string_cache_is_bounded(self):
+        runs = [Run(id=f"r{i}", test_id="t") for i in range(CACHE_LIMIT + 1)]
+        write_snapshot(self.path, runs)
+        with Snapshot(self.path) as snapshot:
+            self.assertEqual(list(snapshot.column("id"))[-1], f"r{CACHE_LIMIT}")
+            self.assertIsNone(snapshot._columns["id"]._cache)
+            self.assertEqual(list(snapshot.column("test_id"))[0], "t")
+            self.assertEqual(len(snapshot._columns["test_id"]._cache), 1)
+
+    def test_invalid_files(self):
+        for content in (b"", b"garbage data", MAGIC + struct.pack("<I", 10) + b"{not json}",
+                        MAGIC + struct.pack("<I", 40) + b'{"model": "Nope", "rows": 0, "columns": []}'):
+            with open(self.path, "wb") as f:
+                f.write(content)
+            with self.assertRaises(ValueError):
+                Snapshot(self.path)
+
+    def test_truncated_file(self):
+        write_snapshot(self.path, make_runs(50))
+        with open(self.path, "rb+") as f:
+            f.truncate(os.path.getsize(self.path) // 2)
+        with self.assertRaises(ValueError):
+            Snapshot(self.path)
+
+
+if __name__ == "__main__":
+    unittest.main()
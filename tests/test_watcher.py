@@ -0,0 +1,150 @@
+import threading
+import unittest
+import requests
+from testuff import models
+from testuff.models import Run, Defect
+from testuff.watcher import Watcher
+
+
+class StubClient:
+    def __init__(self):
+        self.objects = []
+        self.calls = []
+        self.errors = []
+
+    def get(self, model_cls, **params):
+        self.calls.append(params)
+        if self.errors:
+            raise self.errors.pop(0)
+        for obj in list(self.objects):
+            if "run_date_gt" in params and not obj.run_date > params["run_date_gt"]:
+                continue
+            if "report_date_gte" in params and not obj.report_date >= params["report_date_gte"]:
+                continue
+            yield obj
+
+
+def run(id, date, status="passed"):
+    return Run(id=id, test_id="t", status=status, run_date=date)
+
+
+def defect(id, date, status="new"):
+    return Defect(id=id, branch_id="b", user_id="u", summary="s", status=status, report_date=date)
+
+
+def ids(objs):
+    return [obj.id for obj in objs]
+
+
+class TestWatcher(unittest.TestCase):
+
+    def setUp(self):
+        self.client = StubClient()
+
+    def test_rejects_unwatchable_model(self):
+        with self.assertRaises(ValueError):
+            Watcher(self.client, models.Test)
+
+    def test_run_same_second_arrival(self):
+        self.client.objects = [run("1", "2026-01-01T00:00:00")]
+        watcher = Watcher(self.client, Run, lab_id="L")
+        self.assertEqual(ids(watcher.poll()), ["1"])
+        self.client.objects.append(run("2", "2026-01-01T00:00:00"))
+        self.assertEqual(ids(watcher.poll()), ["2"])
+        self.assertEqual(self.client.calls[-1], {"lab_id": "L", "run_date_gt": "2025-12-31T23:59:59"})
+        self.assertEqual(ids(watcher.poll()), [])
+
+    def test_run_changed_at_mark(self):
+        self.client.objects = [run("1", "2026-01-01T00:00:00")]
+        watcher = Watcher(self.client, Run)
+        watcher.poll()
+        self.client.objects[0] = run("1", "2026-01-01T00:00:00", "failed")
+        self.assertEqual([obj.status for obj in watcher.poll()], ["failed"])
+
+    def test_defect_boundary_dedup(self):
+        self.client.objects = [defect("1", "2025-01-01T00:00:00"), defect("2", "2025-01-02T00:00:00")]
+        watcher = Watcher(self.client, Defect)
+        self.assertEqual(ids(watcher.poll()), ["1", "2"])
+        self.assertEqual(watcher.since, "2025-01-02T00:00:00")
+        self.assertEqual(ids(watcher.poll()), [])
+        self.client.objects.append(defect("3", "2025-01-02T00:00:00"))
+        self.assertEqual(ids(watcher.poll()), ["3"])
+        self.client.objects[1] = defect("2", "2025-01-02T00:00:00", "closed")
+        self.assertEqual(ids(watcher.poll()), ["2"])
+        self.client.objects.append(defect("4", "2025-01-03T00:00:00"))
+        self.assertEqual(ids(watcher.poll()), ["4"])
+        self.assertEqual(self.client.calls[-1], {"report_date_gte": "2025-01-02T00:00:00"})
+
+    def test_skip_existing(self):
+        self.client.objects = [defect("1", "2025-01-01T00:00:00")]
+        watcher = Watcher(self.client, Defect, skip_existing=True)
+        self.assertEqual(ids(watcher.poll()), [])
+        self.client.objects.append(defect("2", "2025-01-01T00:00:00"))
+        self.assertEqual(ids(watcher.poll()), ["2"])
+
+    def test_skip_existing_after_empty_first_poll(self):
+        watcher = Watcher(self.client, Run, skip_existing=True)
+        self.assertEqual(ids(watcher.poll()), [])
+        self.client.objects.append(run("1", "2026-01-01T00:00:00"))
+        self.assertEqual(ids(watcher.poll()), ["1"])
+
+    def test_undated_objects_reported_once(self):
+        self.client.objects = [Run(id="n", test_id="t")]
+        watcher = Watcher(self.client, Run)
+        self.assertEqual(ids(watcher.poll()), ["n"])
+        self.assertEqual(ids(watcher.poll()), [])
+        self.client.objects.append(Run(id="m", test_id="t"))
+        self.assertEqual(ids(watcher.poll()), ["m"])
+
+    def test_changes_below_mark_are_not_reported(self):
+        self.client.objects = [run("1", "2026-01-01T00:00:00"), run("2", "2026-01-02T00:00:00")]
+        watcher = Watcher(self.client, Run)
+        watcher.poll()
+        self.client.objects[0] = run("1", "2026-01-01T00:00:00", "failed")
+        self.assertEqual(ids(watcher.poll()), [])
+
+    def test_interval_adapts(self):
+        watcher = Watcher(self.client, Defect, min_interval=1, max_interval=4)
+        for expected in (2, 4, 4):
+            watcher.poll()
+            self.assertEqual(watcher.interval, expected)
+        self.client.objects = [defect("1", "2025-01-01T00:00:00")]
+        watcher.poll()
+        self.assertEqual(watcher.interval, 1)
+
+    def test_failing_subscriber_is_isolated(self):
+        self.client.objects = [defect("1", "2025-01-01T00:00:00"), defect("2", "2025-01-02T00:00:00")]
+        watcher = Watcher(self.client, Defect)
+        received = []
+
+        def broken(obj):
+            raise RuntimeError("boom")
+
+        watcher.subscribe(broken)
+        watcher.subscribe(received.append)
+        with self.assertLogs("testuff.watcher", "ERROR"):
+            watcher.poll()
+        self.assertEqual(ids(received), ["1", "2"])
+
+    def test_run_survives_request_errors(self):
+        self.client.errors = [requests.ConnectionError("down"), requests.Timeout("slow")]
+        self.client.objects = [defect("1", "2025-01-01T00:00:00")]
+        watcher = Watcher(self.client, Defect, min_interval=0, max_interval=0)
+        received = []
+
+        def receive(obj):
+            received.append(obj)
+            watcher.stop()
+
+        watcher.subscribe(receive)
+        thread = threading.Thread(target=watcher.run, daemon=True)
+        with self.assertLogs("testuff.watcher", "ERROR"):
+            thread.start()
+            thread.join(5)
+        self.assertFalse(thread.is_alive())
+        self.assertEqual(ids(received), ["1"])
+        self.assertEqual(len(self.client.calls), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -35,6 +35,11 @@ class TestuffClient:
         return None
         
     def get(self, model_cls, **params):
+        for objects in self.get_pages(model_cls, **params):
+            for obj in objects:
+                yield model_cls.from_dict(obj)
+
+    def get_pages(self, model_cls, **params):
         endpoint = model_cls.API_ENDPOINT  
         url = f"{self.base_url}/{API}/{endpoint}/"
         attrs = {}
@@ -48,8 +53,7 @@ class TestuffClient:
             response.raise_for_status()
             response_data = response.json()
             if isinstance(response_data, dict) and "meta" in response_data and "objects" in response_data:
-                for obj in response_data["objects"]:
-                    yield model_cls.from_dict(obj)
+                yield response_data["objects"]
                 attrs = None
                 next = response_data["meta"]["next"]
                 if next:
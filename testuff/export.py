@@ -0,0 +1,193 @@
+import argparse
+import csv
+import dataclasses
+import io
+import json
+import os
+import queue
+import sys
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from . import models
+from .client import TestuffClient
+
+FORMATS = ("jsonl", "csv")
+_DONE = object()
+
+
+class _Failure:
+    def __init__(self, error):
+        self.error = error
+
+
+def export_columns(model_cls):
+    mapping = getattr(model_cls, "_field_mapping", {})
+    return [mapping.get(f.name, f.name) for f in dataclasses.fields(model_cls)]
+
+
+def _encode_page(model_name, fmt, objects):
+    # Runs in worker processes: decode a raw API page and serialize it in one go,
+    # so only text crosses the process boundary.
+    model_cls = getattr(models, model_name)
+    fields = [f.name for f in dataclasses.fields(model_cls)]
+    columns = export_columns(model_cls)
+    buf = io.StringIO()
+    writer = csv.writer(buf) if fmt == "csv" else None
+    for data in objects:
+        obj = model_cls.from_dict(data)
+        values = [getattr(obj, name) for name in fields]
+        if writer:
+            writer.writerow(["" if v is None else json.dumps(v) if isinstance(v, (list, dict)) else v
+                             for v in values])
+        else:
+            buf.write(json.dumps(dict(zip(columns, values))))
+            buf.write("\n")
+    return buf.getvalue(), len(objects)
+
+
+def _put(q, item, stop):
+    while not stop.is_set():
+        try:
+            q.put(item, timeout=0.1)
+            return True
+        except queue.Full:
+            pass
+    return False
+
+
+def _get(q, stop):
+    while not stop.is_set():
+        try:
+            return q.get(timeout=0.1)
+        except queue.Empty:
+            pass
+    return _DONE
+
+
+def _fetch(client, model_cls, params, pages, stop):
+    try:
+        for objects in client.get_pages(model_cls, **params):
+            if not _put(pages, objects, stop):
+                return
+    except BaseException as e:
+        _put(pages, _Failure(e), stop)
+    _put(pages, _DONE, stop)
+
+
+def _encode(model_cls, fmt, pool, pages, chunks, stop):
+    while True:
+        objects = _get(pages, stop)
+        if objects is _DONE or isinstance(objects, _Failure):
+            _put(chunks, objects, stop)
+            return
+        try:
+            if pool:
+                chunk = pool.submit(_encode_page, model_cls.__name__, fmt, objects)
+            else:
+                chunk = _encode_page(model_cls.__name__, fmt, objects)
+        except BaseException as e:
+            _put(chunks, _Failure(e), stop)
+            return
+        if not _put(chunks, chunk, stop):
+            return
+
+
+def export(client, model_cls, out, fmt="jsonl", workers=None, queue_size=8, **params):
+    """Stream every object matching params into out as JSONL or CSV and return the count.
+
+    Page fetching, decoding and writing run concurrently with at most queue_size
+    pages buffered between stages. With workers set, pages are decoded and
+    serialized in a process pool of that size.
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown format: {fmt}, use one of: {', '.join(FORMATS)}")
+    if queue_size < 1:
+        raise ValueError(f"queue_size must be at least 1, got {queue_size}")
+    if workers is not None and workers < 1:
+        raise ValueError(f"workers must be at least 1, got {workers}")
+
+    if fmt == "csv":
+        csv.writer(out).writerow(export_columns(model_cls))
+
+    stop = threading.Event()
+    pages = queue.Queue(maxsize=queue_size)
+    chunks = queue.Queue(maxsize=queue_size)
+    pool = ProcessPoolExecutor(max_workers=workers) if workers else None
+    threads = [
+        threading.Thread(target=_fetch, args=(client, model_cls, params, pages, stop), daemon=True),
+        threading.Thread(target=_encode, args=(model_cls, fmt, pool, pages, chunks, stop), daemon=True),
+    ]
+    for thread in threads:
+        thread.start()
+
+    count = 0
+    try:
+        while True:
+            chunk = chunks.get()
+            if chunk is _DONE:
+                break
+            if isinstance(chunk, _Failure):
+                raise chunk.error
+            text, n = chunk.result() if pool else chunk
+            out.write(text)
+            count += n
+    finally:
+        stop.set()
+        for thread in threads:
+            thread.join()
+        if pool:
+            while not chunks.empty():
+                chunk = chunks.get()
+                if hasattr(chunk, "cancel"):
+                    chunk.cancel()
+            pool.shutdown()
+    return count
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="testuff-export", description="Export Testuff objects to JSONL or CSV")
+    parser.add_argument("model", help="Model to export, e.g. Run, Test, Defect")
+    parser.add_argument("filters", nargs="*", metavar="KEY=VALUE", help="Query parameters, e.g. branch_id=...")
+    parser.add_argument("-o", "--output", help="Output file (default: stdout)")
+    parser.add_argument("-f", "--format", choices=FORMATS, help="Output format (default: from output extension, else jsonl)")
+    parser.add_argument("-w", "--workers", type=int, help="Decode pages in this many processes")
+    parser.add_argument("--queue-size", type=int, default=8, help="Pages buffered between stages")
+    parser.add_argument("--email", default=os.environ.get("TESTUFF_EMAIL"))
+    parser.add_argument("--password", default=os.environ.get("TESTUFF_PASSWORD"))
+    parser.add_argument("--base-url", default=os.environ.get("TESTUFF_BASE_URL", "https://service2.testuff.com"))
+    args = parser.parse_args(argv)
+
+    model_cls = getattr(models, args.model, None)
+    if not isinstance(model_cls, type) or not hasattr(model_cls, "API_ENDPOINT"):
+        parser.error(f"unknown model: {args.model}")
+    if not args.email or not args.password:
+        parser.error("--email and --password (or TESTUFF_EMAIL / TESTUFF_PASSWORD) are required")
+    params = {}
+    for item in args.filters:
+        key, sep, value = item.partition("=")
+        if not sep:
+            parser.error(f"filter must be KEY=VALUE: {item}")
+        if key not in model_cls.ALLOWED_PARAMS:
+            parser.error(f"unknown filter for {model_cls.__name__}: {key}, use one of: {', '.join(model_cls.ALLOWED_PARAMS)}")
+        params[key] = value
+    if args.queue_size < 1:
+        parser.error("--queue-size must be at least 1")
+    if args.workers is not None and args.workers < 1:
+        parser.error("--workers must be at least 1")
+
+    fmt = args.format
+    if fmt is None:
+        fmt = "csv" if args.output and args.output.endswith(".csv") else "jsonl"
+
+    client = TestuffClient(email=args.email, password=args.password, base_url=args.base_url)
+    if args.output:
+        with open(args.output, "w", newline="", encoding="utf8") as out:
+            count = export(client, model_cls, out, fmt, args.workers, args.queue_size, **params)
+    else:
+        count = export(client, model_cls, sys.stdout, fmt, args.workers, args.queue_size, **params)
+    print(f"Exported {count} {model_cls.__name__} objects", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,188 @@
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+from .models import Suite, Test
+
+
+@dataclass
+class ImportReport:
+    created: int = 0
+    skipped: int = 0
+    failures: List[Tuple[str, Any, str]] = field(default_factory=list)  # (kind, definition, error)
+    seconds: float = 0.0
+
+    @property
+    def rate(self):
+        return self.created / self.seconds if self.seconds else 0.0
+
+    def summary(self):
+        return (f"{self.created} created, {self.skipped} skipped, {len(self.failures)} failed "
+                f"in {self.seconds:.1f}s ({self.rate:.1f} items/s)")
+
+
+@dataclass
+class _SuiteNode:
+    definition: Dict[str, Any]
+    parent: Optional["_SuiteNode"] = None
+    id: Optional[str] = None
+    error: Optional[str] = None
+
+
+def read_definitions(path):
+    """Yield top-level suite definitions from a .json, .jsonl, .yaml or .yml file.
+
+    JSON files hold a list of suites or {"suites": [...]} and are loaded whole;
+    JSONL files and YAML documents hold one suite (or such a list) per line /
+    document and are parsed one at a time.
+    """
+    with open(path, encoding="utf8") as f:
+        if path.endswith((".yaml", ".yml")):
+            try:
+                import yaml
+            except ImportError:
+                raise ImportError("PyYAML is required to read YAML definitions: pip install pyyaml")
+            documents = yaml.safe_load_all(f)
+        elif path.endswith(".jsonl"):
+            documents = (json.loads(line) for line in f if line.strip())
+        else:
+            documents = [json.load(f)]
+        for document in documents:
+            if isinstance(document, dict) and "suites" in document and "name" not in document:
+                document = document["suites"]
+            if isinstance(document, list):
+                for suite in document:
+                    yield suite
+            elif document:
+                yield document
+
+
+def _steps(steps):
+    result = []
+    for position, step in enumerate(steps or []):
+        if isinstance(step, str):
+            step = {"description": step}
+        result.append({"position": position, **step})
+    return result
+
+
+class BulkImporter:
+    """Create suites and tests from definitions with bounded concurrency.
+
+    Suites are created level by level (parents before children) and tests once
+    their suite exists; definitions are consumed as they are read, but the
+    suite tree is kept in memory for that ordering. Suites matching an existing (parent, name) and tests
+    matching an existing automation_id in the branch (or, without one, an
+    existing summary in the same suite) are skipped, so re-running an import
+    only creates what is missing.
+    """
+
+    def __init__(self, client, branch_id, concurrency=8):
+        self.client = client
+        self.branch_id = branch_id
+        self.concurrency = concurrency
+
+    def run(self, definitions):
+        report = ImportReport()
+        start = time.monotonic()
+
+        levels = []
+        tests = []
+        for suite in definitions:
+            stack = [(suite, None, 0)]
+            while stack:
+                definition, parent, depth = stack.pop()
+                if not isinstance(definition, dict):
+                    report.failures.append(("suite", definition, "definition must be a mapping"))
+                    continue
+                node = _SuiteNode(definition, parent)
+                if len(levels) <= depth:
+                    levels.append([])
+                levels[depth].append(node)
+                for test in definition.get("tests") or []:
+                    if isinstance(test, dict):
+                        tests.append((node, test))
+                    else:
+                        report.failures.append(("test", test, "definition must be a mapping"))
+                stack.extend((child, node, depth + 1) for child in reversed(definition.get("suites") or []))
+
+        suites = {(s.parent_id or None, s.name): s.id for s in self.client.get(Suite, branch_id=self.branch_id)}
+        automation_ids = set()
+        summaries = set()
+        for t in self.client.get(Test, branch_id=self.branch_id):
+            if t.automation_id:
+                automation_ids.add(t.automation_id)
+            summaries.add((t.suite_id, t.summary))
+
+        with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+            for level in levels:
+                pending = []
+                for node in level:
+                    if node.parent and node.parent.id is None:
+                        node.error = f"parent suite failed: {node.parent.definition.get('name')}"
+                        report.failures.append(("suite", node.definition, node.error))
+                        continue
+                    parent_id = node.parent.id if node.parent else None
+                    key = (parent_id, node.definition.get("name"))
+                    existing = suites.get(key)
+                    if existing:
+                        node.id = existing
+                        report.skipped += 1
+                    elif key in suites:
+                        node.error = f"duplicate suite in definitions: {key[1]}"
+                        report.failures.append(("suite", node.definition, node.error))
+                    else:
+                        # Claim the key so a repeated definition is not created twice
+                        suites[key] = None
+                        pending.append((node, pool.submit(self._add_suite, node.definition, parent_id)))
+                for node, future in pending:
+                    try:
+                        node.id = future.result().id
+                        report.created += 1
+                    except Exception as e:
+                        node.error = str(e)
+                        report.failures.append(("suite", node.definition, node.error))
+
+            pending = []
+            queued = set()
+            for node, definition in tests:
+                automation_id = definition.get("automation_id")
+                key = automation_id if automation_id else (node.id, definition.get("summary"))
+                if node.id is None:
+                    report.failures.append(("test", definition, f"suite failed: {node.definition.get('name')}"))
+                elif key in queued:
+                    report.failures.append(("test", definition, f"duplicate test in definitions: {automation_id or key[1]}"))
+                elif key in automation_ids or key in summaries:
+                    report.skipped += 1
+                else:
+                    queued.add(key)
+                    pending.append((definition, pool.submit(self._add_test, definition, node.id)))
+            for definition, future in pending:
+                try:
+                    future.result()
+                    report.created += 1
+                except Exception as e:
+                    report.failures.append(("test", definition, str(e)))
+
+        report.seconds = time.monotonic() - start
+        return report
+
+    def _add_suite(self, definition, parent_id):
+        params = {k: v for k, v in definition.items() if k not in ("suites", "tests")}
+        params["branch_id"] = self.branch_id
+        if parent_id:
+            params["parent_id"] = parent_id
+        return self.client.add(Suite, **params)
+
+    def _add_test(self, definition, suite_id):
+        params = dict(definition)
+        params["suite_id"] = suite_id
+        if "steps" in params:
+            params["steps"] = _steps(params["steps"])
+        return self.client.add(Test, **params)
+
+
+def import_definitions(client, branch_id, path, concurrency=8):
+    """Import the suites and tests defined in path into a branch and return an ImportReport."""
+    return BulkImporter(client, branch_id, concurrency).run(read_definitions(path))
@@ -364,11 +364,12 @@ class Defect(BaseModel):
     labels: Optional[List[str]] = None
     # Readonly
     test_id: Optional[str] = None
+    report_date: Optional[str] = None
 
     API_ENDPOINT = "defect"
     ALLOWED_PARAMS = ["id", "summary", "status","state", "project_id", "branch_id", "lab_id", 
                     "run_id", "test_id", "user_id", "report_date_gte", "report_date_lte"]
-    FIELDS_READ_ONLY = ["project_id", "branch_id", "test_id"]
+    FIELDS_READ_ONLY = ["project_id", "branch_id", "test_id", "report_date"]
     @classmethod
     def from_dict(cls, data: Dict[str, Any]):
         obj = super().from_dict(data)
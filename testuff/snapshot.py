@@ -0,0 +1,279 @@
+import json
+import mmap
+import struct
+import sys
+import dataclasses
+from array import array
+from . import models
+
+# File layout (little-endian):
+#   MAGIC | u32 header length | JSON header | columns, each section 8-byte aligned
+# Every column is either a fixed-width int64 array, or a uint32 code array pointing
+# into a string dictionary (u64 offsets followed by a utf8 blob).
+MAGIC = b"TSNAPv1\0"
+KIND_INT = "int"
+KIND_STR = "str"
+KIND_JSON = "json"
+
+NULL_INT = -2 ** 63
+MAX_INT = 2 ** 63 - 1
+NULL_CODE = 0xFFFFFFFF
+# Strings are only cached for columns with at most this many distinct values
+CACHE_LIMIT = 4096
+
+_LITTLE_ENDIAN = sys.byteorder == "little"
+
+
+def _align(offset):
+    return (offset + 7) & ~7
+
+
+class _ColumnBuilder:
+    def __init__(self, name):
+        self.name = name
+        self.codes = array("I")
+        self.index = {}
+        self.values = []
+        self.all_int = True
+        self.all_str = True
+
+    def append(self, value):
+        if value is None:
+            self.codes.append(NULL_CODE)
+            return
+        if isinstance(value, str):
+            key = value
+            self.all_int = False
+        elif isinstance(value, int) and not isinstance(value, bool) and NULL_INT < value <= MAX_INT:
+            key = (int, value)
+            self.all_str = False
+        else:
+            key = (json, json.dumps(value, sort_keys=True))
+            self.all_int = self.all_str = False
+        code = self.index.get(key)
+        if code is None:
+            code = len(self.values)
+            self.index[key] = code
+            self.values.append(value)
+        self.codes.append(code)
+
+    @property
+    def kind(self):
+        if self.values and self.all_int:
+            return KIND_INT
+        if self.all_str:
+            return KIND_STR
+        return KIND_JSON
+
+    def data(self):
+        if self.kind == KIND_INT:
+            ints = array("q", (NULL_INT if c == NULL_CODE else self.values[c] for c in self.codes))
+            if not _LITTLE_ENDIAN:
+                ints.byteswap()
+            return ints.tobytes(), b""
+        codes = self.codes
+        if self.kind == KIND_STR:
+            entries = [value.encode("utf8") for value in self.values]
+        else:
+            entries = [json.dumps(value).encode("utf8") for value in self.values]
+        offsets = array("Q", [0])
+        for entry in entries:
+            offsets.append(offsets[-1] + len(entry))
+        if not _LITTLE_ENDIAN:
+            codes.byteswap()
+            offsets.byteswap()
+        return codes.tobytes(), offsets.tobytes() + b"".join(entries)
+
+
+def write_snapshot(path, objs, model_cls=None):
+    """Write model objects to a columnar snapshot file and return the row count.
+
+    Rows are read in a single pass, keeping a 4-byte code per cell plus each
+    column's distinct values in memory; columns are then encoded and written
+    one at a time.
+    """
+    builders = None
+    rows = 0
+    for obj in objs:
+        if builders is None:
+            model_cls = model_cls or type(obj)
+            names = [f.name for f in dataclasses.fields(model_cls)]
+            builders = [_ColumnBuilder(name) for name in names]
+        for builder in builders:
+            builder.append(getattr(obj, builder.name))
+        rows += 1
+
+    if model_cls is None:
+        raise ValueError("model_cls is required to snapshot an empty collection")
+    if builders is None:
+        builders = [_ColumnBuilder(f.name) for f in dataclasses.fields(model_cls)]
+
+    # Reserve room for the header using the widest possible numbers, so columns
+    # can be written before their offsets are known.
+    widest = 2 ** 64
+    columns = [{"name": b.name, "kind": KIND_JSON, "count": widest, "data": widest, "dict": widest}
+               for b in builders]
+    header = {"model": model_cls.__name__, "rows": widest, "columns": columns}
+    header_size = _align(len(json.dumps(header).encode("utf8")))
+
+    with open(path, "wb") as f:
+        offset = _align(len(MAGIC) + 4 + header_size)
+        for i, builder in enumerate(builders):
+            data, dictionary = builder.data()
+            column = columns[i] = {"name": builder.name, "kind": builder.kind, "count": len(builder.values)}
+            builders[i] = None
+            column["data"] = offset
+            f.seek(offset)
+            f.write(data)
+            offset = _align(offset + len(data))
+            column["dict"] = offset
+            f.seek(offset)
+            f.write(dictionary)
+            offset = _align(offset + len(dictionary))
+            del data, dictionary
+        f.truncate(offset)
+
+        header["rows"] = rows
+        encoded = json.dumps(header).encode("utf8")
+        f.seek(0)
+        f.write(MAGIC)
+        f.write(struct.pack("<I", header_size))
+        f.write(encoded.ljust(header_size, b" "))
+    return rows
+
+
+class _Column:
+    def __init__(self, buf, meta, rows):
+        self.name = meta["name"]
+        self.kind = meta["kind"]
+        self.count = meta["count"]
+        self._cache = {} if self.count <= CACHE_LIMIT else None
+        width = 8 if self.kind == KIND_INT else 4
+        try:
+            self._data = self._view(buf, meta["data"], rows, width, "q" if width == 8 else "I")
+            if self.kind != KIND_INT:
+                self._offsets = self._view(buf, meta["dict"], self.count + 1, 8, "Q")
+                self._blob = meta["dict"] + (self.count + 1) * 8
+                self._buf = buf
+        except Exception:
+            self.release()
+            raise
+
+    @staticmethod
+    def _view(buf, offset, count, width, fmt):
+        view = memoryview(buf)[offset:offset + count * width]
+        if len(view) != count * width:
+            view.release()
+            raise ValueError("truncated column")
+        if _LITTLE_ENDIAN:
+            return view.cast(fmt)
+        item = struct.Struct("<" + fmt)
+        return [item.unpack_from(view, i * width)[0] for i in range(count)]
+
+    def __getitem__(self, row):
+        raw = self._data[row]
+        if self.kind == KIND_INT:
+            return None if raw == NULL_INT else raw
+        if raw == NULL_CODE:
+            return None
+        if self.kind == KIND_STR:
+            if self._cache is None:
+                return self._entry(raw)
+            value = self._cache.get(raw)
+            if value is None:
+                value = self._cache[raw] = self._entry(raw)
+            return value
+        # Decoded lists/dicts are mutable, so hand out a fresh copy each time
+        return json.loads(self._entry(raw))
+
+    def _entry(self, code):
+        start = self._blob + self._offsets[code]
+        end = self._blob + self._offsets[code + 1]
+        return str(self._buf[start:end], "utf8")
+
+    def release(self):
+        for attr in ("_data", "_offsets"):
+            view = getattr(self, attr, None)
+            if isinstance(view, memoryview):
+                view.release()
+
+
+class Snapshot:
+    """Read-only, memory-mapped view over a file written by write_snapshot().
+
+    Rows are decoded into model objects only when indexed or iterated;
+    slicing returns another lazy Snapshot over the same mapping.
+    """
+
+    def __init__(self, path):
+        self._root = True
+        self._file = open(path, "rb")
+        try:
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # Empty files cannot be mapped
+            self._file.close()
+            raise ValueError(f"{path} is not a snapshot file")
+        if self._mmap[:len(MAGIC)] != MAGIC:
+            self.close()
+            raise ValueError(f"{path} is not a snapshot file")
+        self._columns = {}
+        try:
+            (header_size,) = struct.unpack_from("<I", self._mmap, len(MAGIC))
+            start = len(MAGIC) + 4
+            header = json.loads(self._mmap[start:start + header_size].decode("utf8"))
+
+            self.model_cls = getattr(models, header["model"], None)
+            if not (isinstance(self.model_cls, type) and issubclass(self.model_cls, models.BaseModel)):
+                raise ValueError(f"unknown model: {header['model']}")
+            for meta in header["columns"]:
+                self._columns[meta["name"]] = _Column(self._mmap, meta, header["rows"])
+            self._rows = range(header["rows"])
+        except (ValueError, KeyError, TypeError, struct.error) as e:
+            self.close()
+            raise ValueError(f"{path} is not a valid snapshot file: {e}")
+
+    def _view(self, rows):
+        view = object.__new__(Snapshot)
+        view.__dict__.update(self.__dict__)
+        view._rows = rows
+        view._root = False
+        return view
+
+    @property
+    def columns(self):
+        return list(self._columns)
+
+    def column(self, name):
+        """Lazily yield the raw values of one column, without building model objects."""
+        column = self._columns[name]
+        for row in self._rows:
+            yield column[row]
+
+    def __len__(self):
+        return len(self._rows)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self._view(self._rows[index])
+        row = self._rows[index]
+        return self.model_cls(**{name: column[row] for name, column in self._columns.items()})
+
+    def __iter__(self):
+        columns = list(self._columns.items())
+        for row in self._rows:
+            yield self.model_cls(**{name: column[row] for name, column in columns})
+
+    def close(self):
+        if not self._root:
+            return
+        for column in getattr(self, "_columns", {}).values():
+            column.release()
+        self._mmap.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
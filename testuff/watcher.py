@@ -0,0 +1,142 @@
+import logging
+import threading
+from datetime import datetime, timedelta
+import requests
+from .models import Run, Defect
+
+log = logging.getLogger(__name__)
+
+# model -> (date field used as high-water mark, query filter used for deltas)
+# Strict "_gt" filters are queried one second below the mark so they include it.
+WATCH_FIELDS = {
+    Run: ("run_date", "run_date_gt"),
+    Defect: ("report_date", "report_date_gte"),
+}
+
+
+class Watcher:
+    """Poll TestuffClient.get for new Run/Defect objects.
+
+    Only objects dated at or after the high-water mark are requested. Objects
+    sharing the mark's timestamp are remembered so they are reported again only
+    if their content changed. Changes to objects dated before the mark are not
+    returned by the date filters and so are never reported. Undated objects are
+    reported once. The poll interval drops to min_interval while objects keep
+    arriving and doubles up to max_interval while idle or after a request error.
+
+    Without since, the first poll fetches every matching object to find the
+    mark and reports them all as new; pass skip_existing=True to only report
+    objects that appear after that first poll.
+    """
+
+    def __init__(self, client, model_cls, since=None, min_interval=1, max_interval=60,
+                 skip_existing=False, **params):
+        if model_cls not in WATCH_FIELDS:
+            raise ValueError(f"{model_cls.__name__} cannot be watched, use one of: "
+                             f"{', '.join(cls.__name__ for cls in WATCH_FIELDS)}")
+        self.client = client
+        self.model_cls = model_cls
+        self.date_field, self.date_param = WATCH_FIELDS[model_cls]
+        self.params = params
+        self.since = since
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.interval = min_interval
+        self.skip_existing = skip_existing
+        self._boundary = {}
+        self._undated = set()
+        self._primed = False
+        self._subscribers = []
+        self._stop = threading.Event()
+
+    def subscribe(self, callback):
+        self._subscribers.append(callback)
+        return callback
+
+    def unsubscribe(self, callback):
+        self._subscribers.remove(callback)
+
+    def poll(self):
+        """Fetch one delta, advance the high-water mark and return the new objects."""
+        params = dict(self.params)
+        if self.since:
+            params[self.date_param] = self._lower_bound(self.since)
+
+        items = []
+        latest = self.since
+        boundary = {}
+        for obj in self.client.get(self.model_cls, **params):
+            date = getattr(obj, self.date_field)
+            if date is not None and self.since is not None and date < self.since:
+                # Below the mark, only returned because of the widened filter
+                continue
+            fingerprint = repr(obj)
+            if date is not None and date == self.since and self._boundary.get(obj.id) == fingerprint:
+                # Seen on the previous poll and unchanged
+                if latest == self.since:
+                    boundary[obj.id] = fingerprint
+                continue
+            if date is None:
+                # Undated objects never move the mark and come back on every poll
+                if obj.id not in self._undated:
+                    self._undated.add(obj.id)
+                    items.append(obj)
+                continue
+            items.append(obj)
+            if latest is None or date > latest:
+                latest = date
+                boundary = {}
+            if date == latest:
+                boundary[obj.id] = fingerprint
+
+        if latest == self.since:
+            # Mark did not move: keep what we knew about it plus anything new at it
+            self._boundary.update(boundary)
+        else:
+            self._boundary = boundary
+        self.since = latest
+        if not self._primed:
+            self._primed = True
+            if self.skip_existing:
+                items = []
+
+        if items:
+            self.interval = self.min_interval
+        else:
+            self.interval = min(self.interval * 2, self.max_interval)
+
+        for obj in items:
+            for callback in list(self._subscribers):
+                try:
+                    callback(obj)
+                except Exception:
+                    log.exception("Watcher subscriber %r failed on %s %s", callback, self.model_cls.__name__, obj.id)
+        return items
+
+    def _lower_bound(self, since):
+        if not self.date_param.endswith("_gt"):
+            return since
+        try:
+            return (datetime.fromisoformat(since) - timedelta(seconds=1)).isoformat()
+        except ValueError:
+            return since
+
+    def __iter__(self):
+        while not self._stop.is_set():
+            try:
+                items = self.poll()
+            except requests.RequestException:
+                log.exception("Polling %s failed, retrying", self.model_cls.__name__)
+                items = []
+                self.interval = min(self.interval * 2, self.max_interval)
+            for obj in items:
+                yield obj
+            self._stop.wait(self.interval)
+
+    def run(self):
+        """Poll until stop() is called, delivering objects to subscribers."""
+        for _ in self:
+            pass
+
+    def stop(self):
+        self._stop.set()